@@ -0,0 +1,170 @@
+// Numeric kernels for the goal predictors in sim.js
+// Plain functions over flat typed arrays, kept monomorphic so the JS engine
+// can compile each predictor update down to a few tight loops.
+
+// -------------------------
+// Q-table packing & log-space helpers
+// -------------------------
+function stackQTables(policies, actionSpaceSize) {
+    /**
+     * Pack every policy's Q-table into one flat Float32Array laid out as
+     * [policy][state_x][state_y][action], so the Q-values of one policy at
+     * one state are a contiguous run of actionSpaceSize entries.
+     *
+     * Returns {data, nx, ny, policyStride}.
+     */
+    const nx = policies[0].qTable.length;
+    const ny = policies[0].qTable[0].length;
+    const policyStride = nx * ny * actionSpaceSize;
+    const data = new Float32Array(policies.length * policyStride);
+
+    let k = 0;
+    for (const policy of policies) {
+        for (let x = 0; x < nx; x++) {
+            for (let y = 0; y < ny; y++) {
+                for (let a = 0; a < actionSpaceSize; a++) {
+                    data[k++] = policy.qTable[x][y][a];
+                }
+            }
+        }
+    }
+    return { data, nx, ny, policyStride };
+}
+
+function logSumExp(values) {
+    /**
+     * Numerically stable log(sum(exp(values))) using the max-shift trick.
+     */
+    let max = -Infinity;
+    for (let i = 0; i < values.length; i++) {
+        if (values[i] > max) max = values[i];
+    }
+    if (max === -Infinity) return -Infinity;
+
+    let sum = 0;
+    for (let i = 0; i < values.length; i++) {
+        sum += Math.exp(values[i] - max);
+    }
+    return max + Math.log(sum);
+}
+
+function logAddExp(a, b) {
+    /**
+     * Numerically stable log(exp(a) + exp(b)).
+     */
+    const max = Math.max(a, b);
+    if (max === -Infinity) return -Infinity;
+    return max + Math.log(Math.exp(a - max) + Math.exp(b - max));
+}
+
+function compileBayesUpdate(alpha, pSwitch, beta, eps, N) {
+    /**
+     * Build the posterior update shared by the Bayesian and CRF predictors,
+     * specialized for fixed hyperparameters and N policies: exponential
+     * forgetting, normalization, goal-switch prior, posterior temperature and
+     * light smoothing, all in log space. Terms that are no-ops for the given
+     * parameters (pSwitch = 0, beta = 1, eps = 0) are skipped, and the mixture
+     * constants are computed once here rather than per update.
+     *
+     * Returns update(logPost, logLikes), which updates logPost in place (left
+     * normalized) and returns the new posterior.
+     */
+    const useSwitch = pSwitch > 0;
+    const useTemp = beta !== 1.0;
+    const useSmooth = eps > 0;
+    const logStay = Math.log(1 - pSwitch);
+    const logSwitch = Math.log(pSwitch / N);
+    const logKeep = Math.log(1 - eps);
+    const logSmooth = Math.log(eps / N);
+
+    return (logPost, logLikes) => {
+        // Exponential forgetting
+        for (let i = 0; i < N; i++) {
+            logPost[i] = (1 - alpha) * logPost[i] + alpha * logLikes[i];
+        }
+
+        // Normalize, goal-switch prior, and (optionally) posterior temperature
+        const logZ = logSumExp(logPost);
+        for (let i = 0; i < N; i++) {
+            let lp = logPost[i] - logZ;
+            if (useSwitch) lp = logAddExp(logStay + lp, logSwitch);
+            if (useTemp) lp /= beta;
+            logPost[i] = lp;
+        }
+        const logZTemp = useTemp ? logSumExp(logPost) : 0;
+
+        // Light smoothing
+        const post = new Array(N);
+        for (let i = 0; i < N; i++) {
+            let lp = logPost[i] - logZTemp;
+            if (useSmooth) lp = logAddExp(logKeep + lp, logSmooth);
+            logPost[i] = lp;
+            post[i] = Math.exp(lp);
+        }
+        return post;
+    };
+}
+
+// -------------------------
+// Log-likelihood kernels
+// -------------------------
+// These write into caller-provided buffers so that per-step updates do not
+// allocate; out has one entry per policy, logits one entry per action.
+
+function gatherLogLikelihoods(logP, policyStride, idx, out) {
+    /**
+     * Read log P(u | pi, s) for every policy from a precomputed table laid out
+     * like stackQTables(); idx is the (state, action) offset within a policy.
+     */
+    for (let i = 0; i < out.length; i++) {
+        out[i] = logP[i * policyStride + idx];
+    }
+    return out;
+}
+
+function crfLogLikelihoods(Q, policyStride, base, userAction, prevAction,
+                           tau, pairwiseWeight, logFloor, logits, out) {
+    /**
+     * Return log P(u | pi, prevAction) for every policy: a softmax over the
+     * unary potentials Q / tau plus the pairwise bonus for repeating
+     * prevAction, floored at logFloor. base is the state offset within a policy.
+     */
+    const A = logits.length;
+    for (let i = 0; i < out.length; i++) {
+        const off = i * policyStride + base;
+        for (let a = 0; a < A; a++) {
+            logits[a] = Q[off + a] / tau;
+        }
+        if (prevAction !== null) {
+            logits[prevAction] += pairwiseWeight;
+        }
+        const logProb = logits[userAction] - logSumExp(logits);
+        out[i] = logAddExp(logProb, logFloor);
+    }
+    return out;
+}
+
+// -------------------------
+// Full predictor steps
+// -------------------------
+function bayesianStep(logP, policyStride, idx, logPost, update, logLikes) {
+    /**
+     * One BayesianPredictor update: likelihood gather + posterior update,
+     * where update comes from compileBayesUpdate(). logLikes is scratch
+     * space of length N.
+     */
+    gatherLogLikelihoods(logP, policyStride, idx, logLikes);
+    return update(logPost, logLikes);
+}
+
+function crfStep(Q, policyStride, base, logPost, userAction, prevAction,
+                 tau, pairwiseWeight, logFloor, update, logits, logLikes) {
+    /**
+     * One CRFPredictor update: CRF likelihoods + posterior update, where
+     * update comes from compileBayesUpdate(). logits (length A) and
+     * logLikes (length N) are scratch space.
+     */
+    crfLogLikelihoods(Q, policyStride, base, userAction, prevAction,
+                      tau, pairwiseWeight, logFloor, logits, logLikes);
+    return update(logPost, logLikes);
+}
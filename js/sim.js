@@ -68,6 +68,7 @@ class DotPolicy {
      * 
      * Public API:
      *   get_q_value(state, action)
+     *   get_q_values(state) -> Q-values for every action
      *   get_action(state) -> argmax over actions
      */
     constructor(qTableFile, qTable) {
@@ -80,9 +81,17 @@ class DotPolicy {
         return this.qTable[state[0]][state[1]][action];
     }
 
+    getQValues(state) {
+        return this.qTable[state[0]][state[1]];
+    }
+
     getAction(state) {
-        const qValues = this.qTable[state[0]][state[1]];
-        return qValues.indexOf(Math.max(...qValues));
+        const qValues = this.getQValues(state);
+        let best = 0;
+        for (let a = 1; a < qValues.length; a++) {
+            if (qValues[a] > qValues[best]) best = a;
+        }
+        return best;
     }
 }
 
@@ -95,79 +104,115 @@ class BayesianPredictor {
         this.N = policies.length;
         this.actionSpaceSize = actionSpaceSize;
         this.eps = eps;
-        this.tau = tau;
+        this._tau = tau;
         
-        // Log posterior
+        // Log posterior (contiguous typed array; returned posteriors stay plain Arrays)
         if (prior === null) {
             prior = new Array(this.N).fill(1.0 / this.N);
         }
-        this.logPost = prior.map(p => Math.log(p + 1e-12));
+        this.logPost = Float64Array.from(prior, p => Math.log(p + 1e-12));
+
+        // Likelihood floor: log P(u | pi) never drops below log(1e-8)
+        this.logFloor = Math.log(1e-8);
+
+        // Stacked Q-tables: [policy][state_x][state_y][action]. Only the
+        // derived log-likelihood table is kept; this._layout holds just the layout.
+        const { data, ...layout } = stackQTables(policies, actionSpaceSize);
+        this._layout = layout;
+        this._buildLogLikelihoodTable(data);
+
+        // Scratch buffer for per-step log-likelihoods
+        this._logLikes = new Float64Array(this.N);
+
+        // Posterior update specialized for the last-used (alpha, pSwitch, beta, eps)
+        this._updateParams = null;
+        this._update = null;
     }
 
-    logLikelihood(state, userAction, policy) {
+    _getUpdate(alpha, pSwitch, beta) {
         /**
-         * Return log P(u | pi).
+         * Return the posterior update compiled for these hyperparameters and
+         * the current this.eps, recompiling only when any of them differ from
+         * the previous call.
          */
-        const Q = [];
-        for (let a = 0; a < this.actionSpaceSize; a++) {
-            Q.push(policy.getQValue(state, a));
+        const eps = this.eps;
+        const params = this._updateParams;
+        if (params === null || params[0] !== alpha || params[1] !== pSwitch
+                || params[2] !== beta || params[3] !== eps) {
+            this._updateParams = [alpha, pSwitch, beta, eps];
+            this._update = compileBayesUpdate(alpha, pSwitch, beta, eps, this.N);
         }
+        return this._update;
+    }
 
-        // Softmax likelihood P(u | pi)
-        const logits = Q.map(q => q / this.tau);
-        const maxLogit = Math.max(...logits);
-        const expLogits = logits.map(l => Math.exp(l - maxLogit));
-        const sumExp = expLogits.reduce((a, b) => a + b, 0);
-        const probs = expLogits.map(e => e / sumExp);
+    get tau() {
+        return this._tau;
+    }
 
-        return Math.log(probs[userAction] + 1e-8);
+    set tau(tau) {
+        // logP depends on tau, so rebuild it whenever tau changes
+        this._tau = tau;
+        this._buildLogLikelihoodTable();
     }
 
-    update(state, userAction, alpha = 0.05, pSwitch = 0.02, beta = 1.0) {
+    _buildLogLikelihoodTable(Q = stackQTables(this.policies, this.actionSpaceSize).data) {
         /**
-         * Bayesian update with forgetting, goal persistence, and posterior smoothing.
+         * Precompute log P(u | pi, s) for every policy, state and action, laid
+         * out as described by this._layout. Rebuilt by the tau setter.
          */
-        // 1. Compute log-likelihoods
-        const logLikes = [];
-        for (let i = 0; i < this.N; i++) {
-            logLikes.push(this.logLikelihood(state, userAction, this.policies[i]));
-        }
-
-        // 2. Exponential forgetting (key fix)
-        this.logPost = this.logPost.map((lp, i) => (1 - alpha) * lp + alpha * logLikes[i]);
-
-        // 3. Normalize in probability space
-        const maxLogP = Math.max(...this.logPost);
-        let post = this.logPost.map(lp => Math.exp(lp - maxLogP));
-        let sumPost = post.reduce((a, b) => a + b, 0);
-        post = post.map(p => p / sumPost);
+        const A = this.actionSpaceSize;
+        const logits = new Array(A);
+        this.logP = new Float32Array(Q.length);
 
-        // 4. Goal-switch prior (intent persistence)
-        if (pSwitch > 0) {
-            post = post.map(p => (1 - pSwitch) * p + pSwitch * (1.0 / this.N));
+        for (let off = 0; off < Q.length; off += A) {
+            for (let a = 0; a < A; a++) {
+                logits[a] = Q[off + a] / this.tau;
+            }
+            const logZ = logSumExp(logits);
+            for (let a = 0; a < A; a++) {
+                this.logP[off + a] = logAddExp(logits[a] - logZ, this.logFloor);
+            }
         }
+    }
 
-        // 5. Posterior temperature (optional but useful)
-        if (beta !== 1.0) {
-            post = post.map(p => Math.pow(p, 1.0 / beta));
-            sumPost = post.reduce((a, b) => a + b, 0);
-            post = post.map(p => p / sumPost);
-        }
+    _tableIndex(state, userAction) {
+        return (state[0] * this._layout.ny + state[1]) * this.actionSpaceSize + userAction;
+    }
 
-        // 6. Light smoothing (numerical safety only)
-        post = post.map(p => (1 - this.eps) * p + this.eps * (1.0 / this.N));
+    logLikelihoods(state, userAction) {
+        /**
+         * Return log P(u | pi) for every policy, using a softmax over Q / tau.
+         */
+        return gatherLogLikelihoods(this.logP, this._layout.policyStride,
+                                    this._tableIndex(state, userAction), new Float64Array(this.N));
+    }
 
-        // 7. Store back in log space
-        this.logPost = post.map(p => Math.log(p + 1e-12));
+    update(state, userAction, alpha = 0.05, pSwitch = 0.02, beta = 1.0) {
+        /**
+         * Bayesian update with forgetting, goal persistence, and posterior smoothing.
+         */
+        return bayesianStep(this.logP, this._layout.policyStride, this._tableIndex(state, userAction),
+                            this.logPost, this._getUpdate(alpha, pSwitch, beta), this._logLikes);
+    }
 
+    updateBatch(states, userActions, alpha = 0.05, pSwitch = 0.02, beta = 1.0) {
+        /**
+         * Replay a trajectory of (state, userAction) pairs, e.g. for offline
+         * analysis or parameter sweeps. Equivalent to calling update() for
+         * each step; returns the final posterior.
+         */
+        const update = this._getUpdate(alpha, pSwitch, beta);
+        let post = this.getProb();
+        for (let t = 0; t < states.length; t++) {
+            post = bayesianStep(this.logP, this._layout.policyStride, this._tableIndex(states[t], userActions[t]),
+                                this.logPost, update, this._logLikes);
+        }
         return post;
     }
 
     getProb() {
-        const maxLogP = Math.max(...this.logPost);
-        let post = this.logPost.map(lp => Math.exp(lp - maxLogP));
-        const sumPost = post.reduce((a, b) => a + b, 0);
-        return post.map(p => p / sumPost);
+        const logZ = logSumExp(this.logPost);
+        return Array.from(this.logPost, lp => Math.exp(lp - logZ));
     }
 }
 
@@ -206,17 +251,53 @@ class MaxEntPredictor {
         this.policies = policies;
         this.N = policies.length;
         this.actionSpaceSize = actionSpaceSize;
-        this.tau = tau;
+        this._tau = tau;
 
         this.maxProbAnyGoal = 0.99;
         this.logMaxProbAnyGoal = Math.log(0.99);
 
+        // Stacked Q-tables: [policy][state_x][state_y][action]. Only the
+        // derived regret table is kept; this._layout holds just the layout.
+        const { data, ...layout } = stackQTables(policies, actionSpaceSize);
+        this._layout = layout;
+        this._buildRegretTable(data);
+
         this._initLogPost();
     }
 
+    get tau() {
+        return this._tau;
+    }
+
+    set tau(tau) {
+        // The regret table depends on tau, so rebuild it whenever tau changes
+        this._tau = tau;
+        this._buildRegretTable();
+    }
+
+    _buildRegretTable(Q = stackQTables(this.policies, this.actionSpaceSize).data) {
+        /**
+         * Precompute (Q(s, a, g) - V(s, g)) / tau for every goal, state and
+         * action, laid out as described by this._layout. Rebuilt by the tau setter.
+         */
+        const A = this.actionSpaceSize;
+        this.regret = new Float32Array(Q.length);
+
+        for (let off = 0; off < Q.length; off += A) {
+            // V(s, g) = max_a Q(s, a, g)  [hindsight value, reward-based]
+            let value = -Infinity;
+            for (let a = 0; a < A; a++) {
+                if (Q[off + a] > value) value = Q[off + a];
+            }
+            for (let a = 0; a < A; a++) {
+                this.regret[off + a] = (Q[off + a] - value) / this.tau;
+            }
+        }
+    }
+
     _initLogPost() {
         const logUniform = Math.log(1.0 / this.N + 1e-12);
-        this.logPost = new Array(this.N).fill(logUniform);
+        this.logPost = new Float64Array(this.N).fill(logUniform);
     }
 
     /**
@@ -228,21 +309,11 @@ class MaxEntPredictor {
      * Normalization then re-scales the distribution.
      */
     update(state, userAction) {
-        for (let i = 0; i < this.N; i++) {
-            const policy = this.policies[i];
-
-            // Collect Q-values for all actions
-            const qValues = [];
-            for (let a = 0; a < this.actionSpaceSize; a++) {
-                qValues.push(policy.getQValue(state, a));
-            }
-
-            // V(s, g) = max_a Q(s, a, g)  [hindsight value, reward-based]
-            const value = Math.max(...qValues);
-            const qUser = policy.getQValue(state, userAction);
+        const idx = (state[0] * this._layout.ny + state[1]) * this.actionSpaceSize + userAction;
 
+        for (let i = 0; i < this.N; i++) {
             // log P(g) += (Q(s,u,g) - V(s,g)) / tau  [always <= 0]
-            this.logPost[i] += (qUser - value) / this.tau;
+            this.logPost[i] += this.regret[i * this._layout.policyStride + idx];
         }
 
         // Normalize via log-sum-exp
@@ -254,16 +325,34 @@ class MaxEntPredictor {
         return this.getProb();
     }
 
+    /**
+     * Replay a trajectory of (state, userAction) pairs, e.g. for offline
+     * analysis. Equivalent to calling update() for each step; returns the
+     * final distribution.
+     */
+    updateBatch(states, userActions) {
+        const stride = this._layout.policyStride;
+        for (let t = 0; t < states.length; t++) {
+            const state = states[t];
+            const idx = (state[0] * this._layout.ny + state[1]) * this.actionSpaceSize + userActions[t];
+            for (let i = 0; i < this.N; i++) {
+                this.logPost[i] += this.regret[i * stride + idx];
+            }
+            this._normalizeLogDist();
+            this._clipProb();
+        }
+        return this.getProb();
+    }
+
     /**
      * Normalize log distribution so probabilities sum to 1.
      * Mirrors normalize_log_distribution() in GoalPredictor.py.
      */
     _normalizeLogDist() {
-        const maxLog = Math.max(...this.logPost);
-        const logSumExp = Math.log(
-            this.logPost.reduce((sum, lp) => sum + Math.exp(lp - maxLog), 0)
-        ) + maxLog;
-        this.logPost = this.logPost.map(lp => lp - logSumExp);
+        const logZ = logSumExp(this.logPost);
+        for (let i = 0; i < this.N; i++) {
+            this.logPost[i] -= logZ;
+        }
     }
 
     /**
@@ -274,7 +363,10 @@ class MaxEntPredictor {
     _clipProb() {
         if (this.N <= 1) return;
 
-        const maxIdx = this.logPost.indexOf(Math.max(...this.logPost));
+        let maxIdx = 0;
+        for (let i = 1; i < this.N; i++) {
+            if (this.logPost[i] > this.logPost[maxIdx]) maxIdx = i;
+        }
         if (this.logPost[maxIdx] <= this.logMaxProbAnyGoal) return;
 
         const maxProb = Math.exp(this.logPost[maxIdx]);
@@ -292,10 +384,8 @@ class MaxEntPredictor {
     }
 
     getProb() {
-        const maxLog = Math.max(...this.logPost);
-        const unnorm = this.logPost.map(lp => Math.exp(lp - maxLog));
-        const Z = unnorm.reduce((a, b) => a + b, 0);
-        return unnorm.map(p => p / Z);
+        const logZ = logSumExp(this.logPost);
+        return Array.from(this.logPost, lp => Math.exp(lp - logZ));
     }
 
     reset() {
@@ -324,57 +414,57 @@ class CRFPredictor {
         this.pSwitch = pSwitch;
         this.beta = beta;
 
-        this.logPost = new Array(this.N).fill(Math.log(1.0 / this.N + 1e-12));
+        this.logPost = new Float64Array(this.N).fill(Math.log(1.0 / this.N + 1e-12));
         this.prevAction = null;
-    }
 
-    logLikelihood(state, userAction, policy) {
-        const logits = new Array(this.actionSpaceSize).fill(0);
+        // Likelihood floor: log P(u | pi) never drops below log(1e-12)
+        this.logFloor = Math.log(1e-12);
 
-        for (let a = 0; a < this.actionSpaceSize; a++) {
-            const unary = this.unaryFn(policy, state, a);
-            const pair = this.prevAction !== null ? this.pairwiseFn(this.prevAction, a) : 0.0;
-            logits[a] = unary + pair;
-        }
+        // Stacked Q-tables: [policy][state_x][state_y][action]
+        this.Q = stackQTables(policies, actionSpaceSize);
 
-        const maxLogit = Math.max(...logits);
-        const expLogits = logits.map(l => Math.exp(l - maxLogit));
-        const Z = expLogits.reduce((a, b) => a + b, 0);
-        const probs = expLogits.map(e => e / Z);
+        // Scratch buffers for per-step logits and log-likelihoods
+        this._logits = new Float64Array(actionSpaceSize);
+        this._logLikes = new Float64Array(this.N);
 
-        return Math.log(probs[userAction] + 1e-12);
+        // Posterior update specialized for the current (alpha, pSwitch, beta, eps)
+        this._updateParams = null;
+        this._update = null;
     }
 
-    update(state, userAction) {
-        // 1. Compute log-likelihoods for all policies
-        const logLikes = this.policies.map(pi => this.logLikelihood(state, userAction, pi));
-
-        // 2. Exponential forgetting
-        this.logPost = this.logPost.map((lp, i) => (1 - this.alpha) * lp + this.alpha * logLikes[i]);
-
-        // 3. Normalize in probability space
-        const maxLog = Math.max(...this.logPost);
-        let post = this.logPost.map(lp => Math.exp(lp - maxLog));
-        let sumPost = post.reduce((a, b) => a + b, 0);
-        post = post.map(p => p / sumPost);
-
-        // 4. Goal-switch prior (intent persistence)
-        if (this.pSwitch > 0) {
-            post = post.map(p => (1 - this.pSwitch) * p + this.pSwitch * (1.0 / this.N));
+    _getUpdate() {
+        /**
+         * Return the posterior update compiled for the current hyperparameter
+         * fields, recompiling only when any of them changed since the last call.
+         */
+        const params = this._updateParams;
+        if (params === null || params[0] !== this.alpha || params[1] !== this.pSwitch
+                || params[2] !== this.beta || params[3] !== this.eps) {
+            this._updateParams = [this.alpha, this.pSwitch, this.beta, this.eps];
+            this._update = compileBayesUpdate(this.alpha, this.pSwitch, this.beta, this.eps, this.N);
         }
+        return this._update;
+    }
 
-        // 5. Posterior temperature
-        if (this.beta !== 1.0) {
-            post = post.map(p => Math.pow(p, 1.0 / this.beta));
-            sumPost = post.reduce((a, b) => a + b, 0);
-            post = post.map(p => p / sumPost);
-        }
+    _stateOffset(state) {
+        return (state[0] * this.Q.ny + state[1]) * this.actionSpaceSize;
+    }
 
-        // 6. Light smoothing
-        post = post.map(p => (1 - this.eps) * p + this.eps * (1.0 / this.N));
+    logLikelihoods(state, userAction) {
+        /**
+         * Return log P(u | pi, prevAction) for every policy.
+         */
+        return crfLogLikelihoods(this.Q.data, this.Q.policyStride, this._stateOffset(state),
+                                 userAction, this.prevAction, this.tau, this.pairwiseWeight,
+                                 this.logFloor, this._logits, new Float64Array(this.N));
+    }
 
-        // 7. Store back in log space
-        this.logPost = post.map(p => Math.log(p + 1e-12));
+    update(state, userAction) {
+        // 1-7. CRF likelihoods, forgetting, goal-switch prior, temperature, smoothing
+        const post = crfStep(this.Q.data, this.Q.policyStride, this._stateOffset(state),
+                             this.logPost, userAction, this.prevAction,
+                             this.tau, this.pairwiseWeight, this.logFloor,
+                             this._getUpdate(), this._logits, this._logLikes);
 
         // 8. Update temporal context
         this.prevAction = userAction;
@@ -382,25 +472,33 @@ class CRFPredictor {
         return post;
     }
 
+    updateBatch(states, userActions) {
+        /**
+         * Replay a trajectory of (state, userAction) pairs, e.g. for offline
+         * analysis or parameter sweeps. Equivalent to calling update() for
+         * each step; returns the final posterior.
+         */
+        const update = this._getUpdate();
+        let post = this.getProb();
+        for (let t = 0; t < states.length; t++) {
+            post = crfStep(this.Q.data, this.Q.policyStride, this._stateOffset(states[t]),
+                           this.logPost, userActions[t], this.prevAction,
+                           this.tau, this.pairwiseWeight, this.logFloor,
+                           update, this._logits, this._logLikes);
+            this.prevAction = userActions[t];
+        }
+        return post;
+    }
+
     getProb() {
-        const maxLog = Math.max(...this.logPost);
-        let post = this.logPost.map(lp => Math.exp(lp - maxLog));
-        const sumPost = post.reduce((a, b) => a + b, 0);
-        return post.map(p => p / sumPost);
+        const logZ = logSumExp(this.logPost);
+        return Array.from(this.logPost, lp => Math.exp(lp - logZ));
     }
 
     reset() {
-        this.logPost = new Array(this.N).fill(Math.log(1.0 / this.N + 1e-12));
+        this.logPost = new Float64Array(this.N).fill(Math.log(1.0 / this.N + 1e-12));
         this.prevAction = null;
     }
-
-    unaryFn(policy, state, action) {
-        return policy.getQValue(state, action) / this.tau;
-    }
-
-    pairwiseFn(prevAction, action) {
-        return prevAction === action ? this.pairwiseWeight : 0.0;
-    }
 }
 
 // -------------------------
@@ -411,27 +509,47 @@ class SharedAutoPolicy {
         this.policies = policies;
         this.actionSpace = actionSpace;
         
+        // Stacked Q-tables: [policy][state_x][state_y][action]. Only the
+        // normalized copy is kept; this._layout holds just the layout.
+        this.actionSpaceSize = policies[0].qTable[0][0].length;
+        const { data, ...layout } = stackQTables(policies, this.actionSpaceSize);
+        this._layout = layout;
+
         // Pre-compute normalization parameters for each policy
         this.qMins = [];
         this.qMaxs = [];
-        
-        for (const policy of policies) {
+
+        const stride = this._layout.policyStride;
+        for (let i = 0; i < policies.length; i++) {
             let min = Infinity;
             let max = -Infinity;
-            
-            for (let i = 0; i < policy.qTable.length; i++) {
-                for (let j = 0; j < policy.qTable[i].length; j++) {
-                    for (let k = 0; k < policy.qTable[i][j].length; k++) {
-                        const val = policy.qTable[i][j][k];
-                        if (val < min) min = val;
-                        if (val > max) max = val;
-                    }
-                }
+
+            for (let k = i * stride; k < (i + 1) * stride; k++) {
+                const val = data[k];
+                if (val < min) min = val;
+                if (val > max) max = val;
             }
-            
+
             this.qMins.push(min);
             this.qMaxs.push(max);
         }
+
+        // Normalized Q-values, laid out as described by this._layout
+        this.QNorm = new Float32Array(data.length);
+        for (let i = 0; i < policies.length; i++) {
+            for (let k = i * stride; k < (i + 1) * stride; k++) {
+                this.QNorm[k] = this.normalizeQValue(data[k], i);
+            }
+        }
+    }
+
+    normalizedQValues(policyIdx, state) {
+        /**
+         * Normalized Q-values of one policy for every action at a state.
+         */
+        const A = this.actionSpaceSize;
+        const off = policyIdx * this._layout.policyStride + (state[0] * this._layout.ny + state[1]) * A;
+        return this.QNorm.subarray(off, off + A);
     }
 
     normalizeQValue(qValue, policyIdx) {
@@ -449,51 +567,47 @@ class SharedAutoPolicy {
 
     getAction(state, probPolicy, returnDist = false, sample = false) {
         const actions = this.actionSpace;
-        const qs = [];
-        
-        // Get Q-values and normalize them
+
+        // Compute expected Q-values: probPolicy @ QNorm[:, state, :]
+        const expectedQ = new Array(actions.length).fill(0);
         for (let i = 0; i < this.policies.length; i++) {
-            const rawQs = [];
-            for (const a of actions) {
-                rawQs.push(this.policies[i].getQValue(state, a));
+            const qs = this.normalizedQValues(i, state);
+            for (let a = 0; a < actions.length; a++) {
+                expectedQ[a] += probPolicy[i] * qs[actions[a]];
             }
-            const normalizedQs = rawQs.map(q => this.normalizeQValue(q, i));
-            qs.push(normalizedQs);
         }
         
-        // Compute expected Q-values
-        const expectedQ = new Array(actions.length).fill(0);
-        for (let a = 0; a < actions.length; a++) {
-            for (let i = 0; i < this.policies.length; i++) {
-                expectedQ[a] += probPolicy[i] * qs[i][a];
-            }
+        // Greedy action; the softmax is only needed for returnDist / sample
+        let maxIdx = 0;
+        for (let a = 1; a < expectedQ.length; a++) {
+            if (expectedQ[a] > expectedQ[maxIdx]) maxIdx = a;
         }
-        
-        // Apply logsumexp normalization
-        const maxQ = Math.max(...expectedQ);
-        const normalizedQ = expectedQ.map(q => q - maxQ);
-        const expQ = normalizedQ.map(q => Math.exp(q));
-        const sumExpQ = expQ.reduce((a, b) => a + b, 0);
-        
+        if (!returnDist && !sample) {
+            return actions[maxIdx];
+        }
+
         if (returnDist) {
-            const dist = expQ.map(q => q / sumExpQ);
-            const maxIdx = expectedQ.indexOf(Math.max(...expectedQ));
-            return [actions[maxIdx], dist];
-        } else if (sample) {
-            const dist = expQ.map(q => q / sumExpQ);
-            const rand = Math.random();
-            let cumSum = 0;
-            for (let i = 0; i < dist.length; i++) {
-                cumSum += dist[i];
-                if (rand <= cumSum) {
-                    return actions[i];
-                }
+            const logZ = logSumExp(expectedQ);
+            return [actions[maxIdx], expectedQ.map(q => Math.exp(q - logZ))];
+        }
+
+        // Sample against the unnormalized softmax weights (in place) rather
+        // than building a normalized copy
+        const maxQ = expectedQ[maxIdx];
+        let total = 0;
+        for (let a = 0; a < expectedQ.length; a++) {
+            expectedQ[a] = Math.exp(expectedQ[a] - maxQ);
+            total += expectedQ[a];
+        }
+        const rand = Math.random() * total;
+        let cumSum = 0;
+        for (let i = 0; i < expectedQ.length; i++) {
+            cumSum += expectedQ[i];
+            if (rand <= cumSum) {
+                return actions[i];
             }
-            return actions[actions.length - 1];
-        } else {
-            const maxIdx = expectedQ.indexOf(Math.max(...expectedQ));
-            return actions[maxIdx];
         }
+        return actions[actions.length - 1];
     }
 }
 
@@ -564,10 +678,15 @@ class DotSimulator {
         this.ingredientPositions = [];
         // Currently active spoon image (null = use default agentImage)
         this.activeSpoonImage = null;
+        // Filename of the ingredient currently on the spoon (null = none)
+        this.activeIngredient = null;
         // Proximity threshold (pixels) to trigger ingredient pickup
         this.INGREDIENT_PROXIMITY = 80;
         // Proximity threshold for bowl (larger since bowl is 300px wide)
         this.BOWL_PROXIMITY = 120;
+        // Squared thresholds, so proximity checks can skip the sqrt
+        this.INGREDIENT_PROXIMITY_SQ = this.INGREDIENT_PROXIMITY * this.INGREDIENT_PROXIMITY;
+        this.BOWL_PROXIMITY_SQ = this.BOWL_PROXIMITY * this.BOWL_PROXIMITY;
         // Bowl position (populated in loadBackgroundImages)
         this.bowlPosition = null;
 
@@ -577,6 +696,9 @@ class DotSimulator {
         // Robot confidence (for probabilistic arbitration)
         this.robotConfidence = 0.0;
 
+        // Repaint only when something visible changed (movement, image load, reset)
+        this.needsRedraw = true;
+
         this.setupEventListeners();
     }
 
@@ -660,6 +782,7 @@ class DotSimulator {
                         height: yscale,
                         loaded: true
                     };
+                    this.needsRedraw = true;
                     console.log("Cursor image loaded successfully");
                 };
                 img.onerror = () => {
@@ -675,11 +798,14 @@ class DotSimulator {
             img.onload = () => {
                 this.backgroundImages[filename] = {
                     image: img,
-                    pos: [parseFloat(x), parseFloat(y)],
+                    // Top-left draw position (image is centered on x, y)
+                    drawX: parseFloat(x) - xscale / 2,
+                    drawY: parseFloat(y) - yscale / 2,
                     width: xscale,
                     height: yscale,
                     loaded: true
                 };
+                this.needsRedraw = true;
                 console.log(`Background image loaded: ${filename}`);
             };
             img.onerror = () => {
@@ -704,6 +830,7 @@ class DotSimulator {
                         height: yscale,
                         loaded: true
                     };
+                    this.needsRedraw = true;
                     console.log(`Ingredient spoon image loaded: ${spoonFile}`);
                 };
                 spoonImg.onerror = () => {
@@ -722,6 +849,7 @@ class DotSimulator {
                             height: yscale,
                             loaded: true
                         };
+                        this.needsRedraw = true;
                         console.log(`Bowl overlay image loaded: ${bowlOverlayFile}`);
                     };
                     bowlImg.onerror = () => {
@@ -757,19 +885,16 @@ class DotSimulator {
         /**
          * Draw all background images at their specified positions.
          */
+        // All backgrounds share one alpha, so set the context state once
+        this.ctx.save();
+        this.ctx.globalAlpha = 0.9;
         for (const filename in this.backgroundImages) {
             const data = this.backgroundImages[filename];
             if (data.loaded) {
-                const imgRect = {
-                    x: data.pos[0] - data.width / 2,
-                    y: data.pos[1] - data.height / 2
-                };
-                this.ctx.save();
-                this.ctx.globalAlpha = 0.9;
-                this.ctx.drawImage(data.image, imgRect.x, imgRect.y, data.width, data.height);
-                this.ctx.restore();
+                this.ctx.drawImage(data.image, data.drawX, data.drawY, data.width, data.height);
             }
         }
+        this.ctx.restore();
 
         // Draw deposited ingredient overlays on top of the bowl
         if (this.bowlPosition && this.depositedIngredients.length > 0) {
@@ -838,10 +963,11 @@ class DotSimulator {
         for (const ingredient of this.ingredientPositions) {
             const dx = this.dotX - ingredient.x;
             const dy = this.dotY - ingredient.y;
-            if (Math.sqrt(dx * dx + dy * dy) < this.INGREDIENT_PROXIMITY) {
+            if (dx * dx + dy * dy < this.INGREDIENT_PROXIMITY_SQ) {
                 const spoonImg = this.ingredientSpoonImages[ingredient.filename];
                 if (spoonImg && spoonImg.loaded) {
                     this.activeSpoonImage = spoonImg;
+                    this.activeIngredient = ingredient.filename;
                 }
                 break;
             }
@@ -851,19 +977,15 @@ class DotSimulator {
         if (this.bowlPosition && this.activeSpoonImage) {
             const dx = this.dotX - this.bowlPosition.x;
             const dy = this.dotY - this.bowlPosition.y;
-            if (Math.sqrt(dx * dx + dy * dy) < this.BOWL_PROXIMITY) {
-                // Identify which ingredient is on the spoon and record the deposit
-                for (const ingredient of this.ingredientPositions) {
-                    const spoonImg = this.ingredientSpoonImages[ingredient.filename];
-                    if (spoonImg === this.activeSpoonImage) {
-                        if (!this.depositedIngredients.includes(ingredient.filename)) {
-                            this.depositedIngredients.push(ingredient.filename);
-                            console.log(`Deposited ingredient: ${ingredient.filename}`);
-                        }
-                        break;
-                    }
+            if (dx * dx + dy * dy < this.BOWL_PROXIMITY_SQ) {
+                // Record the deposit of the ingredient on the spoon
+                const filename = this.activeIngredient;
+                if (!this.depositedIngredients.includes(filename)) {
+                    this.depositedIngredients.push(filename);
+                    console.log(`Deposited ingredient: ${filename}`);
                 }
                 this.activeSpoonImage = null; // Revert to plain spoon (default agentImage)
+                this.activeIngredient = null;
             }
         }
 
@@ -877,6 +999,8 @@ class DotSimulator {
             this.ctx.arc(this.dotX, dotScreenY, this.DOT_RADIUS, 0, Math.PI * 2);
             this.ctx.fill();
         }
+
+        this.needsRedraw = false;
     }
 
     // -------------------------
@@ -950,6 +1074,7 @@ class DotSimulator {
         this.prob = new Array(this.POLICIES.length).fill(1.0 / this.POLICIES.length);
         this.robotConfidence = 0.0;
         this.predictor = this.createPredictor();
+        this.needsRedraw = true;
         this.updateUI();
     }
 
@@ -990,9 +1115,12 @@ class DotSimulator {
                 u = 3;
             }
 
-            // If no user action: robot does nothing
+            // If no user action: robot does nothing, and the frame is unchanged
+            // unless something else (e.g. an image load) marked it dirty
             if (u === -1) {
-                this.redrawScreen();
+                if (this.needsRedraw) {
+                    this.redrawScreen();
+                }
                 requestAnimationFrame(gameLoop);
                 return;
             }